@@ -18,16 +18,12 @@ def _load_engine() -> tuple[SummaryEngine | None, str | None]:
 
 engine, data_error = _load_engine()
 
+# Plain string options serialize to roughly half the payload of label/value dicts.
 if engine:
-    author_options = [
-        {"label": author, "value": author} for author in engine.available_authors()
-    ]
-    team_options = [
-        {"label": team, "value": team} for team in engine.available_teams()
-    ]
-    repo_options = [
-        {"label": repo, "value": repo} for repo in engine.available_repos()
-    ]
+    dimensions = engine.available_dimensions()
+    author_options = dimensions["author"]
+    team_options = dimensions["team"]
+    repo_options = dimensions["repository"]
 else:
     author_options = []
     team_options = []
@@ -110,6 +106,8 @@ app.layout = html.Div(
                 dcc.Tab(label="Contributor Deep-Dive", value="contrib"),
             ],
         ),
+        dcc.Store(id="scope-store"),
+        html.Div(id="kpi-content", style={"marginTop": "16px"}),
         html.Div(id="tab-content", style={"marginTop": "16px"}),
         html.Div(
             id="data-error",
@@ -134,33 +132,46 @@ def toggle_scope_inputs(scope: str) -> tuple[bool, bool]:
 
 
 @app.callback(
-    Output("tab-content", "children"),
-    Input("tabs", "value"),
+    Output("scope-store", "data"),
+    Output("kpi-content", "children"),
     Input("scope-select", "value"),
     Input("team-select", "value"),
     Input("user-select", "value"),
-    Input("org-group-select", "value"),
 )
-def render_tab(
-    tab: str,
-    scope: str,
-    selected_team: str | None,
-    selected_user: str | None,
-    org_group_by: str,
-):
+def render_kpis(scope: str, selected_team: str | None, selected_user: str | None):
     if engine is None:
-        return html.Div("No data loaded. Add data/prs.ipc and data/teams.csv.")
+        return None, html.Div("No data loaded. Add data/prs.ipc and data/teams.csv.")
 
+    # Drop values the scope ignores so each distinct frame has one cache entry.
+    if scope != "individual":
+        selected_user = None
+    if scope != "team":
+        selected_team = None
     selection = ScopeSelection(
         scope=scope, selected_user=selected_user, selected_team=selected_team
     )
     scoped_df = engine.scoped_df(selection)
 
     if scoped_df.is_empty():
-        return html.Div("No data for the selected scope.")
+        return None, html.Div("No data for the selected scope.")
+
+    # The store carries the selection so tab switches reuse the cached scoped
+    # frame without recomputing the KPI cards.
+    store = {"scope": scope, "selected_user": selected_user, "selected_team": selected_team}
+    return store, _render_kpis(engine.aggregate(scoped_df, None))
+
 
-    kpi_df = engine.aggregate(scoped_df, None)
-    kpi_cards = _render_kpis(kpi_df)
+@app.callback(
+    Output("tab-content", "children"),
+    Input("tabs", "value"),
+    Input("org-group-select", "value"),
+    Input("scope-store", "data"),
+)
+def render_tab(tab: str, org_group_by: str, store: dict | None):
+    if engine is None or not store:
+        return None
+
+    scoped_df = engine.scoped_df(ScopeSelection(**store))
 
     if tab == "exec":
         group_by = org_group_by
@@ -170,22 +181,22 @@ def render_tab(
         group_by = "author"
 
     if group_by not in scoped_df.columns:
-        return html.Div([kpi_cards, html.Div(f"Missing column: {group_by}")])
+        return html.Div(f"Missing column: {group_by}")
 
     agg_df = engine.aggregate(scoped_df, group_by)
     chart = _render_bar_chart(agg_df, group_by)
     table = _render_table(agg_df)
 
-    return html.Div([kpi_cards, chart, table])
+    return html.Div([chart, table])
 
 
 def _render_kpis(kpi_df):
-    row = kpi_df.row(0, named=True)
+    row = SummaryEngine.format_kpis(kpi_df).row(0, named=True)
     items = [
-        ("Total Merged PRs", row.get("total_merged_prs")),
-        ("Median Lead Time (hrs)", _fmt(row.get("lead_time_median_hrs"))),
-        ("Median Review Latency (hrs)", _fmt(row.get("review_latency_median_hrs"))),
-        ("Avg Code Churn", _fmt(row.get("code_churn_avg"))),
+        ("Total Merged PRs", row["total_merged_prs"]),
+        ("Median Lead Time (hrs)", row["lead_time_median_hrs"]),
+        ("Median Review Latency (hrs)", row["review_latency_median_hrs"]),
+        ("Avg Code Churn", row["code_churn_avg"]),
     ]
     return html.Div(
         style={"display": "flex", "gap": "12px", "flexWrap": "wrap"},
@@ -197,7 +208,7 @@ def _render_kpis(kpi_df):
                     "borderRadius": "8px",
                     "minWidth": "180px",
                 },
-                children=[html.Div(label), html.Div(str(value))],
+                children=[html.Div(label), html.Div(value)],
             )
             for label, value in items
         ],
@@ -205,11 +216,11 @@ def _render_kpis(kpi_df):
 
 
 def _render_bar_chart(agg_df, group_by: str):
-    pdf = agg_df.to_pandas()
+    # Plotly takes plain lists, so skip the Arrow -> pandas copy.
     fig = px.bar(
-        pdf,
-        x=group_by,
-        y="total_merged_prs",
+        x=agg_df.get_column(group_by).to_list(),
+        y=agg_df.get_column("total_merged_prs").to_list(),
+        labels={"x": group_by, "y": "total_merged_prs"},
         title="Merged PRs",
     )
     fig.update_layout(margin={"l": 20, "r": 20, "t": 40, "b": 20})
@@ -217,23 +228,14 @@ def _render_bar_chart(agg_df, group_by: str):
 
 
 def _render_table(agg_df):
-    pdf = agg_df.to_pandas()
     return dash_table.DataTable(
-        data=pdf.to_dict("records"),
-        columns=[{"name": col, "id": col} for col in pdf.columns],
+        data=agg_df.to_dicts(),
+        columns=[{"name": col, "id": col} for col in agg_df.columns],
         page_size=10,
         style_table={"overflowX": "auto"},
     )
 
 
-def _fmt(value):
-    if value is None:
-        return "-"
-    if isinstance(value, float):
-        return f"{value:.2f}"
-    return value
-
-
 def main() -> None:
     app.run_server(debug=True)
 
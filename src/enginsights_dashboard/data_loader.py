@@ -9,11 +9,14 @@ import polars as pl
 DATA_DIR = Path(__file__).resolve().parents[2] / "data"
 
 
-def load_prs(path: Optional[Path] = None) -> pl.DataFrame:
+def load_prs(path: Optional[Path] = None) -> pl.LazyFrame:
     prs_path = path or (DATA_DIR / "prs.ipc")
     if not prs_path.exists():
         raise FileNotFoundError(f"PR dataset not found: {prs_path}")
-    return pl.read_ipc(prs_path)
+    # Scan lazily so SummaryEngine's column selection and exclusion filters
+    # are pushed into the memory-mapped read (see _base_lf for the ordering
+    # this relies on).
+    return pl.scan_ipc(prs_path, memory_map=True)
 
 
 def load_teams(path: Optional[Path] = None) -> Optional[pl.DataFrame]:
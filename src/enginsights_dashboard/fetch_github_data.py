@@ -1,6 +1,10 @@
 from __future__ import annotations
 
 import argparse
+import sqlite3
+import threading
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
@@ -10,6 +14,7 @@ import logging
 
 import polars as pl
 from github import Github
+from github.GithubRetry import GithubRetry
 from github.PullRequest import PullRequest
 from github.Repository import Repository
 
@@ -21,23 +26,106 @@ class FetchOptions:
     orgs: list[str]
     repositories: list[str]
     lookback_days: int
+    max_workers: int = 8
+
+
+# Pause once the remaining core quota drops below this many requests.
+RATE_LIMIT_FLOOR = 50
+
+PR_SCHEMA = {
+    "org": pl.Utf8,
+    "author": pl.Utf8,
+    "repository": pl.Utf8,
+    "number": pl.UInt32,
+    "created_at": pl.Datetime("us", "UTC"),
+    "merged_at": pl.Datetime("us", "UTC"),
+    "review_requested_at": pl.Datetime("us", "UTC"),
+    "first_reviewed_at": pl.Datetime("us", "UTC"),
+    "additions": pl.UInt32,
+    "deletions": pl.UInt32,
+    "is_fork": pl.Boolean,
+    "is_archived": pl.Boolean,
+    # Replaced by a vectorized `is_bot` column once the frame is built.
+    "user_type": pl.Utf8,
+    "html_url": pl.Utf8,
+}
+
+TEAM_SCHEMA = {"org": pl.Utf8, "author": pl.Utf8, "team": pl.Utf8}
+
+
+class PRDetailCache:
+    """SQLite store of per-PR detail, reused while a PR's `updated_at` is unchanged."""
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS pr_details ("
+                "repository TEXT, number INTEGER, updated_at TEXT, "
+                "additions INTEGER, deletions INTEGER, "
+                "review_requested_at TEXT, first_reviewed_at TEXT, "
+                "PRIMARY KEY (repository, number))"
+            )
+
+    def get(self, repository: str, number: int, updated_at: Optional[datetime]) -> Optional[tuple]:
+        if updated_at is None:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT additions, deletions, review_requested_at, first_reviewed_at "
+                "FROM pr_details WHERE repository = ? AND number = ? AND updated_at = ?",
+                (repository, number, updated_at.isoformat()),
+            ).fetchone()
+        if row is None:
+            return None
+        additions, deletions, requested, reviewed = row
+        return additions, deletions, _parse_ts(requested), _parse_ts(reviewed)
+
+    def put(
+        self,
+        repository: str,
+        number: int,
+        updated_at: Optional[datetime],
+        detail: tuple,
+    ) -> None:
+        if updated_at is None:
+            return
+        additions, deletions, requested, reviewed = detail
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pr_details VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    repository,
+                    number,
+                    updated_at.isoformat(),
+                    additions,
+                    deletions,
+                    requested.isoformat() if requested else None,
+                    reviewed.isoformat() if reviewed else None,
+                ),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
+
+
+def _parse_ts(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
 
 
 def _utc_now() -> datetime:
     return datetime.now(timezone.utc)
 
 
+# PyGithub 2.x already returns tz-aware UTC datetimes, so timestamps are compared
+# and stored as-is; PR_SCHEMA pins the column time zone to UTC.
 def _should_stop(pr: PullRequest, cutoff: datetime) -> bool:
-    updated_at = pr.updated_at.replace(tzinfo=timezone.utc) if pr.updated_at else None
-    created_at = pr.created_at.replace(tzinfo=timezone.utc) if pr.created_at else None
-    merged_at = pr.merged_at.replace(tzinfo=timezone.utc) if pr.merged_at else None
-    if updated_at and updated_at >= cutoff:
-        return False
-    if created_at and created_at >= cutoff:
-        return False
-    if merged_at and merged_at >= cutoff:
-        return False
-    return True
+    timestamps = [ts for ts in (pr.updated_at, pr.created_at, pr.merged_at) if ts]
+    return not timestamps or max(timestamps) < cutoff
 
 
 def _iter_repos(org, repo_names: list[str]) -> Iterable[Repository]:
@@ -53,25 +141,17 @@ def _iter_repos(org, repo_names: list[str]) -> Iterable[Repository]:
 
 
 def _review_requested_at(repo: Repository, pr: PullRequest) -> Optional[datetime]:
-    try:
-        issue = repo.get_issue(pr.number)
-        events = issue.get_events()
-    except Exception:  # noqa: BLE001
-        return None
+    events = repo.get_issue(pr.number).get_events()
     timestamps = []
     for event in events:
         if getattr(event, "event", None) == "review_requested":
             if event.created_at:
-                timestamps.append(event.created_at.replace(tzinfo=timezone.utc))
+                timestamps.append(event.created_at)
     return min(timestamps) if timestamps else None
 
 
 def _first_reviewed_at(pr: PullRequest, requested_at: Optional[datetime]) -> Optional[datetime]:
-    try:
-        reviews = pr.get_reviews()
-    except Exception:  # noqa: BLE001
-        return None
-
+    reviews = pr.get_reviews()
     candidates: list[datetime] = []
     for review in reviews:
         state = getattr(review, "state", None)
@@ -80,104 +160,178 @@ def _first_reviewed_at(pr: PullRequest, requested_at: Optional[datetime]) -> Opt
             continue
         if not submitted_at:
             continue
-        ts = submitted_at.replace(tzinfo=timezone.utc)
-        if requested_at and ts < requested_at:
+        if requested_at and submitted_at < requested_at:
             continue
-        candidates.append(ts)
+        candidates.append(submitted_at)
 
     return min(candidates) if candidates else None
 
 
-def _is_bot(login: Optional[str], user_type: Optional[str]) -> bool:
-    if user_type == "Bot":
-        return True
-    if login and login.endswith("[bot]"):
-        return True
-    return False
+def _wait_for_rate_limit(gh: Github) -> None:
+    remaining, _ = gh.rate_limiting
+    if remaining >= RATE_LIMIT_FLOOR:
+        return
+    delay = max(gh.rate_limiting_resettime - time.time(), 0) + 1
+    logging.warning("Rate limit nearly exhausted (%s left). Sleeping %.0fs.", remaining, delay)
+    time.sleep(delay)
 
 
-def fetch_prs(gh: Github, options: FetchOptions) -> pl.DataFrame:
+def _pr_detail(gh: Github, repo: Repository, pr: PullRequest) -> tuple[tuple, bool]:
+    """Return the detail tuple and whether every lookup succeeded."""
+    _wait_for_rate_limit(gh)
+    complete = True
+    try:
+        review_requested_at = _review_requested_at(repo, pr)
+    except Exception:  # noqa: BLE001
+        review_requested_at = None
+        complete = False
+    try:
+        first_reviewed_at = _first_reviewed_at(pr, review_requested_at)
+    except Exception:  # noqa: BLE001
+        first_reviewed_at = None
+        complete = False
+    # additions/deletions are not in the list payload, so reading them
+    # completes the PR with its own request.
+    detail = (pr.additions, pr.deletions, review_requested_at, first_reviewed_at)
+    return detail, complete
+
+
+def _pr_row(
+    gh: Github,
+    org_name: str,
+    repo: Repository,
+    pr: PullRequest,
+    cache: Optional[PRDetailCache],
+) -> tuple:
+    author = pr.user.login if pr.user else "unknown"
+    detail = cache.get(repo.full_name, pr.number, pr.updated_at) if cache else None
+    if detail is None:
+        detail, complete = _pr_detail(gh, repo, pr)
+        # Failed lookups are retried on the next run instead of cached as None.
+        if cache and complete:
+            cache.put(repo.full_name, pr.number, pr.updated_at, detail)
+    additions, deletions, review_requested_at, first_reviewed_at = detail
+
+    # Field order matches PR_SCHEMA.
+    return (
+        org_name,
+        author,
+        repo.full_name,
+        pr.number,
+        pr.created_at,
+        pr.merged_at,
+        review_requested_at,
+        first_reviewed_at,
+        additions,
+        deletions,
+        repo.fork,
+        repo.archived,
+        getattr(pr.user, "type", None),
+        pr.html_url,
+    )
+
+
+def _fetch_repo_prs(
+    gh: Github,
+    org_name: str,
+    repo: Repository,
+    cutoff: datetime,
+    pr_pool: Executor,
+    cache: Optional[PRDetailCache],
+) -> list[tuple]:
+    pulls: list[PullRequest] = []
+    for pr in repo.get_pulls(state="all", sort="updated", direction="desc"):
+        if _should_stop(pr, cutoff):
+            break
+        pulls.append(pr)
+    # Per-PR detail, event and review lookups are independent round-trips.
+    return list(pr_pool.map(lambda pr: _pr_row(gh, org_name, repo, pr, cache), pulls))
+
+
+def fetch_prs(
+    gh: Github, options: FetchOptions, cache: Optional[PRDetailCache] = None
+) -> pl.DataFrame:
     cutoff = _utc_now() - timedelta(days=options.lookback_days)
-    rows: list[dict] = []
+    rows: list[tuple] = []
 
     repo_map = _map_repos_by_org(options.orgs, options.repositories)
 
-    for org_name in options.orgs:
-        org = gh.get_organization(org_name)
-        repo_names = repo_map.get(org_name, [])
-        for repo in _iter_repos(org, repo_names):
-            pulls = repo.get_pulls(state="all", sort="updated", direction="desc")
-            for pr in pulls:
-                if _should_stop(pr, cutoff):
-                    break
-
-                author = pr.user.login if pr.user else "unknown"
-                is_bot = _is_bot(author, getattr(pr.user, "type", None))
-                created_at = (
-                    pr.created_at.replace(tzinfo=timezone.utc) if pr.created_at else None
-                )
-                merged_at = pr.merged_at.replace(tzinfo=timezone.utc) if pr.merged_at else None
-
-                review_requested_at = _review_requested_at(repo, pr)
-                first_reviewed_at = _first_reviewed_at(pr, review_requested_at)
-
-                rows.append(
-                    {
-                        "org": org_name,
-                        "author": author,
-                        "repository": repo.full_name,
-                        "number": pr.number,
-                        "created_at": created_at,
-                        "merged_at": merged_at,
-                        "review_requested_at": review_requested_at,
-                        "first_reviewed_at": first_reviewed_at,
-                        "additions": pr.additions,
-                        "deletions": pr.deletions,
-                        "is_fork": repo.fork,
-                        "is_archived": repo.archived,
-                        "is_bot": is_bot,
-                        "html_url": pr.html_url,
-                    }
-                )
-
-    return pl.DataFrame(rows)
+    # Repo tasks only wait on PR tasks, so separate pools cannot deadlock.
+    with (
+        ThreadPoolExecutor(max_workers=options.max_workers) as repo_pool,
+        ThreadPoolExecutor(max_workers=options.max_workers) as pr_pool,
+    ):
+        futures = []
+        try:
+            for org_name in options.orgs:
+                org = gh.get_organization(org_name)
+                repo_names = repo_map.get(org_name, [])
+                for repo in _iter_repos(org, repo_names):
+                    futures.append(
+                        repo_pool.submit(
+                            _fetch_repo_prs, gh, org_name, repo, cutoff, pr_pool, cache
+                        )
+                    )
+            for future in futures:
+                rows.extend(future.result())
+        except BaseException:
+            # Drop queued work so a failure surfaces without draining every repo.
+            repo_pool.shutdown(wait=False, cancel_futures=True)
+            pr_pool.shutdown(wait=False, cancel_futures=True)
+            raise
+
+    return _build_pr_frame(rows)
+
+
+def _build_pr_frame(rows: list[tuple]) -> pl.DataFrame:
+    # Transpose into one list per column so Polars builds each Arrow array
+    # directly against the declared schema, with no per-row dicts to infer from.
+    columns = list(zip(*rows)) if rows else [() for _ in PR_SCHEMA]
+    df = pl.DataFrame(dict(zip(PR_SCHEMA, columns)), schema=PR_SCHEMA)
+    bot_login = pl.col("author").str.ends_with("[bot]").fill_null(False)
+    is_bot = pl.col("user_type").eq_missing("Bot") | bot_login
+    return df.with_columns(is_bot.alias("is_bot")).drop("user_type")
+
+
+def _team_member_logins(team) -> list[str]:
+    return [member.login for member in team.get_members()]
 
 
 def fetch_team_mapping(
-    gh: Github, org_names: list[str], team_field: str = "slug"
+    gh: Github, org_names: list[str], team_field: str = "slug", max_workers: int = 8
 ) -> pl.DataFrame:
-    rows: list[dict] = []
-    for org_name in org_names:
-        org = gh.get_organization(org_name)
-        for team in org.get_teams():
-            team_value = team.slug if team_field == "slug" else team.name
-            for member in team.get_members():
-                rows.append({"org": org_name, "author": member.login, "team": team_value})
-    return pl.DataFrame(rows)
+    orgs: list[str] = []
+    authors: list[str] = []
+    teams: list[str] = []
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for org_name in org_names:
+            org = gh.get_organization(org_name)
+            org_teams = list(org.get_teams())
+            # Each team's member listing is an independent paginated request.
+            for team, logins in zip(org_teams, pool.map(_team_member_logins, org_teams)):
+                team_value = team.slug if team_field == "slug" else team.name
+                orgs.extend([org_name] * len(logins))
+                authors.extend(logins)
+                teams.extend([team_value] * len(logins))
+    return pl.DataFrame({"org": orgs, "author": authors, "team": teams}, schema=TEAM_SCHEMA)
 
 
 def _map_repos_by_org(org_names: list[str], repo_args: list[str]) -> dict[str, list[str]]:
-    if not repo_args:
-        return {org_name: [] for org_name in org_names}
-
-    full_name_map: dict[str, list[str]] = {org_name: [] for org_name in org_names}
-    plain_names: list[str] = []
+    result: dict[str, list[str]] = {org_name: [] for org_name in org_names}
     for value in repo_args:
         if "/" in value:
             org_name, repo_name = value.split("/", 1)
-            if org_name not in org_names:
+            if org_name not in result:
                 raise ValueError(
                     f"Repo {value} does not match provided orgs: {', '.join(org_names)}"
                 )
-            full_name_map.setdefault(org_name, []).append(repo_name)
+            result[org_name].append(repo_name)
         else:
-            plain_names.append(value)
-
-    if plain_names:
-        for org_name in org_names:
-            full_name_map.setdefault(org_name, []).extend(plain_names)
+            for repo_names in result.values():
+                repo_names.append(value)
 
-    return full_name_map
+    # A repo named both as org/repo and as a plain name is fetched once.
+    return {org_name: list(dict.fromkeys(names)) for org_name, names in result.items()}
 
 
 def write_outputs(prs_df: pl.DataFrame, teams_df: Optional[pl.DataFrame], out_dir: Path) -> None:
@@ -216,6 +370,12 @@ def parse_args() -> argparse.Namespace:
         default=DEFAULT_CONFIG.lookback_days,
         help="Lookback window in days.",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="Concurrent GitHub requests used while fetching PRs and teams.",
+    )
     parser.add_argument(
         "--output",
         default=str(Path(__file__).resolve().parents[2] / "data"),
@@ -226,6 +386,11 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Skip fetching team mapping.",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Refetch every PR instead of reusing cached detail from earlier runs.",
+    )
     parser.add_argument(
         "--team-field",
         choices=["slug", "name"],
@@ -247,7 +412,13 @@ def main() -> None:
     if not token:
         raise SystemExit("Missing GITHUB_TOKEN environment variable.")
 
-    gh = Github(token, per_page=100)
+    gh = Github(
+        token,
+        per_page=100,
+        retry=GithubRetry(total=5, backoff_factor=2, status_forcelist=[502, 503, 504]),
+        # Both fetch pools share this client; keep one connection per thread.
+        pool_size=2 * args.workers,
+    )
     logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 
     orgs = [name.strip() for name in args.orgs.split(",") if name.strip()]
@@ -262,13 +433,19 @@ def main() -> None:
         orgs=orgs,
         repositories=repos,
         lookback_days=args.lookback,
+        max_workers=args.workers,
     )
 
-    prs_df = fetch_prs(gh, options)
+    cache = None if args.no_cache else PRDetailCache(Path(args.output) / "pr_cache.sqlite")
+    try:
+        prs_df = fetch_prs(gh, options, cache)
+    finally:
+        if cache:
+            cache.close()
 
     teams_df = None
     if not args.no_teams:
-        teams_df = fetch_team_mapping(gh, orgs, args.team_field)
+        teams_df = fetch_team_mapping(gh, orgs, args.team_field, args.workers)
 
     write_outputs(prs_df, teams_df, Path(args.output))
 
@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import polars as pl
+import pytest
+
+from enginsights_dashboard.fetch_github_data import (
+    PR_SCHEMA,
+    TEAM_SCHEMA,
+    FetchOptions,
+    PRDetailCache,
+    _build_pr_frame,
+    _map_repos_by_org,
+    fetch_prs,
+    fetch_team_mapping,
+)
+
+
+NOW = datetime.now(timezone.utc)
+
+
+class StubPR:
+    def __init__(self, number, login="alice", user_type="User", age_days=1, reviews=None):
+        self.number = number
+        self.user = SimpleNamespace(login=login, type=user_type)
+        self.updated_at = NOW - timedelta(days=age_days)
+        self.created_at = NOW - timedelta(days=age_days)
+        self.merged_at = None
+        self.additions = 10 * number
+        self.deletions = number
+        self.html_url = f"https://example.test/pull/{number}"
+        self._reviews = reviews or []
+
+    def get_reviews(self):
+        return self._reviews
+
+
+class StubRepo:
+    def __init__(self, full_name, pulls, fail=False, delay=0.0):
+        self.full_name = full_name
+        self.fork = False
+        self.archived = False
+        self._pulls = pulls
+        self._fail = fail
+        self._delay = delay
+        self.listed = False
+        self.issue_fails = False
+        self.issue_calls = 0
+
+    def get_pulls(self, **kwargs):
+        self.listed = True
+        time.sleep(self._delay)
+        if self._fail:
+            raise RuntimeError(f"listing {self.full_name} failed")
+        return self._pulls
+
+    def get_issue(self, number):
+        self.issue_calls += 1
+        if self.issue_fails:
+            raise RuntimeError("issue lookup failed")
+        return SimpleNamespace(get_events=lambda: [])
+
+
+class StubTeam:
+    def __init__(self, slug, name, logins, delay=0.0):
+        self.slug = slug
+        self.name = name
+        self._logins = logins
+        self._delay = delay
+
+    def get_members(self):
+        time.sleep(self._delay)
+        return [SimpleNamespace(login=login) for login in self._logins]
+
+
+class StubOrg:
+    def __init__(self, login, repos, teams=()):
+        self.login = login
+        self._repos = repos
+        self._teams = list(teams)
+
+    def get_repos(self, type):
+        return self._repos
+
+    def get_teams(self):
+        return self._teams
+
+
+class StubGithub:
+    rate_limiting = (5000, 5000)
+    rate_limiting_resettime = 0
+
+    def __init__(self, orgs):
+        self._orgs = {org.login: org for org in orgs}
+
+    def get_organization(self, name):
+        return self._orgs[name]
+
+
+def _stub_github():
+    repos = [
+        StubRepo("org-a/api", [StubPR(3), StubPR(2), StubPR(1), StubPR(9, age_days=400)]),
+        StubRepo("org-a/web", [StubPR(5), StubPR(4)]),
+    ]
+    return StubGithub([StubOrg("org-a", repos)])
+
+
+def test_fetch_prs_keeps_repo_order_and_stops_at_cutoff():
+    df = fetch_prs(_stub_github(), FetchOptions(["org-a"], [], lookback_days=30))
+
+    assert df.select(["repository", "number"]).rows() == [
+        ("org-a/api", 3),
+        ("org-a/api", 2),
+        ("org-a/api", 1),
+        ("org-a/web", 5),
+        ("org-a/web", 4),
+    ]
+
+
+def test_fetch_prs_matches_serial_output():
+    options = FetchOptions(["org-a"], [], lookback_days=30)
+    serial = fetch_prs(_stub_github(), FetchOptions(**{**vars(options), "max_workers": 1}))
+
+    assert fetch_prs(_stub_github(), options).equals(serial)
+
+
+def test_fetch_prs_cancels_queued_repos_on_failure():
+    repos = [StubRepo("org-a/broken", [], fail=True)] + [
+        StubRepo(f"org-a/repo{i}", [StubPR(1)], delay=0.05) for i in range(5)
+    ]
+    gh = StubGithub([StubOrg("org-a", repos)])
+
+    with pytest.raises(RuntimeError):
+        fetch_prs(gh, FetchOptions(["org-a"], [], lookback_days=30, max_workers=1))
+
+    assert sum(repo.listed for repo in repos) < len(repos)
+
+
+def _expected_pr_schema():
+    schema = {name: dtype for name, dtype in PR_SCHEMA.items() if name != "user_type"}
+    schema["is_bot"] = pl.Boolean
+    return schema
+
+
+def test_fetch_prs_uses_declared_schema():
+    df = fetch_prs(_stub_github(), FetchOptions(["org-a"], [], lookback_days=30))
+
+    assert dict(df.schema) == _expected_pr_schema()
+    assert df.schema["number"] == pl.UInt32
+    assert df.schema["additions"] == pl.UInt32
+
+
+def test_fetch_prs_empty_result_is_typed():
+    gh = StubGithub([StubOrg("org-a", [])])
+
+    df = fetch_prs(gh, FetchOptions(["org-a"], [], lookback_days=30))
+
+    assert df.is_empty()
+    assert dict(df.schema) == _expected_pr_schema()
+
+
+def _raw_row(author, user_type):
+    values = dict.fromkeys(PR_SCHEMA)
+    values.update(author=author, user_type=user_type, number=1, additions=1, deletions=0)
+    return tuple(values.values())
+
+
+def test_build_pr_frame_derives_is_bot():
+    rows = [
+        _raw_row("renovate", "Bot"),
+        _raw_row("dependabot[bot]", "User"),
+        _raw_row("carol", None),
+        _raw_row("alice", "User"),
+        _raw_row(None, "User"),
+    ]
+
+    df = _build_pr_frame(rows)
+
+    assert "user_type" not in df.columns
+    assert df.get_column("is_bot").to_list() == [True, True, False, False, False]
+
+
+def test_pr_detail_cache_round_trip(tmp_path):
+    path = tmp_path / "pr_cache.sqlite"
+    updated_at = datetime(2026, 2, 1, tzinfo=timezone.utc)
+    requested_at = datetime(2026, 2, 1, 12, tzinfo=timezone.utc)
+
+    cache = PRDetailCache(path)
+    cache.put("org-a/api", 1, updated_at, (10, 2, requested_at, None))
+    cache.close()
+
+    cache = PRDetailCache(path)
+    detail = cache.get("org-a/api", 1, updated_at)
+    missed = cache.get("org-a/api", 1, updated_at + timedelta(seconds=1))
+    cache.close()
+
+    assert detail == (10, 2, requested_at, None)
+    assert detail[2].tzinfo is not None
+    assert missed is None
+
+
+def test_failed_review_lookup_is_not_cached(tmp_path):
+    repo = StubRepo("org-a/api", [StubPR(1)])
+    gh = StubGithub([StubOrg("org-a", [repo])])
+    options = FetchOptions(["org-a"], [], lookback_days=30)
+
+    for fails in (True, False, False):
+        repo.issue_fails = fails
+        cache = PRDetailCache(tmp_path / "pr_cache.sqlite")
+        fetch_prs(gh, options, cache)
+        cache.close()
+
+    # The failed first run is retried; the successful second run is reused.
+    assert repo.issue_calls == 2
+
+
+def _stub_team_github():
+    teams = [
+        # The slow first team finishes last; its rows must still come first.
+        StubTeam("alpha", "Alpha Team", ["alice", "bob"], delay=0.05),
+        StubTeam("empty", "Empty Team", []),
+        StubTeam("beta", "Beta Team", ["carol"]),
+    ]
+    return StubGithub([StubOrg("org-a", [], teams), StubOrg("org-b", [])])
+
+
+def test_fetch_team_mapping_keeps_team_order():
+    df = fetch_team_mapping(_stub_team_github(), ["org-a", "org-b"], max_workers=4)
+
+    assert df.rows() == [
+        ("org-a", "alice", "alpha"),
+        ("org-a", "bob", "alpha"),
+        ("org-a", "carol", "beta"),
+    ]
+    assert dict(df.schema) == TEAM_SCHEMA
+
+
+def test_fetch_team_mapping_uses_team_name():
+    df = fetch_team_mapping(_stub_team_github(), ["org-a"], team_field="name", max_workers=4)
+
+    assert df.get_column("team").unique(maintain_order=True).to_list() == [
+        "Alpha Team",
+        "Beta Team",
+    ]
+
+
+def test_fetch_team_mapping_empty_input_is_typed():
+    df = fetch_team_mapping(_stub_team_github(), ["org-b"])
+
+    assert df.is_empty()
+    assert dict(df.schema) == TEAM_SCHEMA
+
+
+def test_map_repos_by_org_applies_plain_names_and_dedupes():
+    repo_map = _map_repos_by_org(["org-a", "org-b"], ["org-a/api", "api", "web", "web"])
+
+    assert repo_map == {"org-a": ["api", "web"], "org-b": ["api", "web"]}
+
+
+def test_map_repos_by_org_rejects_unknown_org():
+    with pytest.raises(ValueError):
+        _map_repos_by_org(["org-a"], ["org-b/api"])
@@ -5,6 +5,7 @@ from datetime import datetime, timedelta, timezone
 import polars as pl
 
 from enginsights_dashboard.config import AppConfig
+from enginsights_dashboard.data_loader import load_prs
 from enginsights_dashboard.summary_engine import ScopeSelection, SummaryEngine
 
 
@@ -75,6 +76,7 @@ def test_median_lead_time_and_review_latency():
 
     assert row["lead_time_median_hrs"] == 15.0
     assert row["review_latency_median_hrs"] == 3.0
+    assert abs(row["code_churn_avg"] - 5 / 11) < 1e-6
 
 
 def test_pr_size_classes():
@@ -95,6 +97,16 @@ def test_pr_size_classes():
     assert row["prs_large"] == 1
 
 
+def test_null_additions_count_as_large():
+    now = datetime(2026, 2, 6, tzinfo=timezone.utc)
+    rows = [_base_row(additions=10), _base_row(additions=None)]
+    engine = SummaryEngine(pl.DataFrame(rows), config=AppConfig(lookback_days=30), now=now)
+    agg = engine.aggregate(engine.scoped_df(ScopeSelection(scope="org")), None)
+    row = agg.row(0, named=True)
+
+    assert (row["prs_small"], row["prs_medium"], row["prs_large"]) == (1, 0, 1)
+
+
 def test_team_join_uses_org_when_present():
     now = datetime(2026, 2, 6, tzinfo=timezone.utc)
     rows = [
@@ -115,3 +127,93 @@ def test_team_join_uses_org_when_present():
     assert scoped.height == 2
     teams = scoped.select(["org", "team"]).sort("org").to_dict(as_series=False)
     assert teams == {"org": ["org-a", "org-b"], "team": ["alpha", "beta"]}
+
+
+def test_individual_scope_and_repo_rename():
+    now = datetime(2026, 2, 6, tzinfo=timezone.utc)
+    rows = [_base_row(author="alice"), _base_row(author="bob")]
+    df = pl.DataFrame(rows).rename({"repository": "repo"})
+    engine = SummaryEngine(df, config=AppConfig(lookback_days=30), now=now)
+
+    scoped = engine.scoped_df(ScopeSelection(scope="individual", selected_user="bob"))
+    assert scoped.select(["author", "repository"]).rows() == [("bob", "org/repo")]
+
+    empty = engine.scoped_df(ScopeSelection(scope="individual"))
+    assert empty.is_empty()
+
+
+def test_base_df_is_computed_once():
+    now = datetime(2026, 2, 6, tzinfo=timezone.utc)
+    df = pl.DataFrame([_base_row(author="bob"), _base_row(author="alice")])
+    engine = SummaryEngine(df, config=AppConfig(lookback_days=30), now=now)
+
+    assert engine._base_df() is engine._base_df()
+    assert engine.available_authors() == ["alice", "bob"]
+    assert engine.available_teams() == []
+
+
+def test_available_teams_skip_unmapped_authors():
+    now = datetime(2026, 2, 6, tzinfo=timezone.utc)
+    prs_df = pl.DataFrame([_base_row(author="alice"), _base_row(author="carol")])
+    teams_df = pl.DataFrame([{"author": "alice", "team": "alpha"}])
+
+    engine = SummaryEngine(prs_df, team_df=teams_df, config=AppConfig(30), now=now)
+
+    assert engine.available_dimensions() == {
+        "author": ["alice", "carol"],
+        "team": ["alpha"],
+        "repository": ["org/repo"],
+    }
+
+
+def test_format_kpis_rounds_and_fills_missing():
+    now = datetime(2026, 2, 6, tzinfo=timezone.utc)
+    rows = [_base_row(merged_at=None, review_requested_at=None)]
+    engine = SummaryEngine(pl.DataFrame(rows), config=AppConfig(lookback_days=30), now=now)
+    kpi_df = engine.aggregate(engine.scoped_df(ScopeSelection(scope="org")), None)
+
+    row = SummaryEngine.format_kpis(kpi_df).row(0, named=True)
+
+    assert row["total_merged_prs"] == "0"
+    assert row["lead_time_median_hrs"] == "-"
+    assert row["review_latency_median_hrs"] == "-"
+    assert row["code_churn_avg"] == "0.45"
+
+
+def test_scoped_df_reuses_recent_selections():
+    now = datetime(2026, 2, 6, tzinfo=timezone.utc)
+    df = pl.DataFrame([_base_row(author="alice"), _base_row(author="bob")])
+    engine = SummaryEngine(df, config=AppConfig(lookback_days=30), now=now)
+
+    first = engine.scoped_df(ScopeSelection(scope="individual", selected_user="bob"))
+    second = engine.scoped_df(ScopeSelection(scope="individual", selected_user="bob"))
+
+    assert first is second
+    assert first.get_column("author").to_list() == ["bob"]
+
+
+def test_base_df_prunes_unused_columns():
+    now = datetime(2026, 2, 6, tzinfo=timezone.utc)
+    df = pl.DataFrame([_base_row(org="org-a", number=7, html_url="https://example.test/7")])
+    engine = SummaryEngine(df, config=AppConfig(lookback_days=30), now=now)
+
+    columns = engine.scoped_df(ScopeSelection(scope="org")).columns
+
+    assert "org" in columns
+    assert "number" not in columns
+    assert "html_url" not in columns
+
+
+def test_exclusion_filters_are_pushed_into_ipc_scan(tmp_path):
+    now = datetime(2026, 2, 6, tzinfo=timezone.utc)
+    prs_path = tmp_path / "prs.ipc"
+    pl.DataFrame([_base_row(), _base_row(author="bot", is_bot=True)]).write_ipc(prs_path)
+
+    engine = SummaryEngine(load_prs(prs_path), config=AppConfig(lookback_days=30), now=now)
+    plan = engine._base_lf().explain()
+
+    assert "FILTER" not in plan
+    selection = next(line for line in plan.splitlines() if "SELECTION:" in line)
+    for column in ("is_fork", "is_archived", "is_bot", "created_at"):
+        assert f'col("{column}")' in selection
+    assert engine.available_authors() == ["alice"]